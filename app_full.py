@@ -6,26 +6,53 @@ from datetime import datetime, timedelta
 import sys
 sys.path.append('src')
 
-from models.demand_forecast import generate_pricing_recommendations, forecast_product_demand
-from models.logistics_optimizer import train_delay_predictor, recommend_optimal_routes, predict_route_delays
-from models.predictive_maintenance import train_failure_predictor, predict_machine_health
+from models.demand_forecast import forecast_product_demand
+from models.delay_sketches import build_delay_sketches
+from downsampling import downsample_frame
+from incremental_loader import RAW_TABLES, IncrementalLoader, IncrementalState
+from precompute import SnapshotStore, PrecomputeScheduler, data_fingerprint, run_pipeline
 
 st.set_page_config(page_title="NovaCorp UDIP", layout="wide", page_icon="🎯")
 
-@st.cache_data
+DASHBOARD_TABLES = ['orders', 'products', 'customers', 'shipments', 'routes',
+                    'machines', 'sensors', 'economy', 'competitor']
+
+@st.cache_resource
+def get_data_loader():
+    """Shared loader that re-reads only rows appended to data/raw"""
+    return IncrementalLoader('data/raw', {table: RAW_TABLES[table] for table in DASHBOARD_TABLES})
+
 def load_data():
-    """Load all datasets"""
-    orders = pd.read_csv('data/raw/orders.csv')
-    products = pd.read_csv('data/raw/products.csv')
-    customers = pd.read_csv('data/raw/customers.csv')
-    shipments = pd.read_csv('data/raw/shipments.csv')
-    routes = pd.read_csv('data/raw/routes.csv')
-    machines = pd.read_csv('data/raw/machines.csv')
-    sensors = pd.read_csv('data/raw/machine_sensors.csv')
-    economy = pd.read_csv('data/raw/external_economy.csv')
-    competitor = pd.read_csv('data/raw/competitor_pricing.csv')
-    
-    return orders, products, customers, shipments, routes, machines, sensors, economy, competitor
+    """Load all datasets (only new rows are parsed on later runs)"""
+    loader = get_data_loader()
+    loader.refresh()
+    t, _ = loader.snapshot()
+    
+    return tuple(t[table] for table in DASHBOARD_TABLES)
+
+@st.cache_resource
+def get_delay_sketches():
+    """Route and global delay sketches, updated with appended shipments"""
+    return IncrementalState(get_data_loader(), 'shipments', build_delay_sketches,
+                            lambda sketches, added: sketches.update(added))
+
+@st.cache_resource
+def get_precompute_scheduler():
+    """Background thread keeping the snapshot store fresh"""
+    return PrecomputeScheduler(get_data_loader(), SnapshotStore('data/snapshots')).start()
+
+def get_snapshot_store():
+    return get_precompute_scheduler().store
+
+def load_snapshot(name):
+    """Precomputed pipeline result for the current data (computed inline if missing)"""
+    loader = get_data_loader()
+    store = get_snapshot_store()
+    _, states = loader.snapshot()
+    snapshot = store.latest(name, data_fingerprint(states, name))
+    if snapshot is None:
+        snapshot = run_pipeline(name, loader, store)
+    return snapshot['result']
 
 # Load data
 try:
@@ -45,6 +72,11 @@ page = st.sidebar.radio("Navigate", [
     "📊 Analytics & Insights"
 ])
 
+scheduler = get_precompute_scheduler()
+if scheduler.last_error is not None:
+    st.sidebar.warning(f"⚠️ Background precompute failing since {scheduler.last_error_at:%H:%M:%S} "
+                       f"({scheduler.last_error!r}); pages are computed on demand.")
+
 # ============= EXECUTIVE DASHBOARD =============
 if page == "🏠 Executive Dashboard":
     st.title("🏠 Executive Dashboard")
@@ -69,12 +101,13 @@ if page == "🏠 Executive Dashboard":
     
     with col1:
         st.subheader("📊 Revenue Trend")
-        orders['order_date'] = pd.to_datetime(orders['order_date'])
-        daily_revenue = orders.groupby(orders['order_date'].dt.to_period('M')).apply(
+        order_months = pd.to_datetime(orders['order_date']).dt.to_period('M')
+        daily_revenue = orders.groupby(order_months).apply(
             lambda x: (x['price'] * x['quantity']).sum()
         ).reset_index()
         daily_revenue.columns = ['month', 'revenue']
-        daily_revenue['month'] = daily_revenue['month'].astype(str)
+        daily_revenue['month'] = daily_revenue['month'].dt.to_timestamp()
+        daily_revenue = downsample_frame(daily_revenue, 'month', 'revenue')
         
         fig = px.line(daily_revenue, x='month', y='revenue', title='Monthly Revenue')
         st.plotly_chart(fig, use_container_width=True)
@@ -122,7 +155,7 @@ elif page == "📈 Demand & Pricing":
         st.subheader("💰 Dynamic Pricing Recommendations")
         
         with st.spinner("Generating recommendations..."):
-            recommendations = generate_pricing_recommendations(orders, products, competitor, top_n=10)
+            recommendations = load_snapshot('pricing')['recommendations']
         
         st.dataframe(recommendations, use_container_width=True)
         
@@ -154,6 +187,7 @@ elif page == "📈 Demand & Pricing":
                 product_orders['order_date'] = pd.to_datetime(product_orders['order_date'])
                 historical = product_orders.groupby('order_date')['quantity'].sum().reset_index()
                 historical.columns = ['date', 'quantity']
+                historical = downsample_frame(historical, 'date', 'quantity')
                 
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(x=historical['date'], y=historical['quantity'],
@@ -181,23 +215,34 @@ elif page == "🚚 Logistics Optimizer":
         st.subheader("⏱️ Shipment Delay Prediction")
         
         with st.spinner("Training delay prediction model..."):
-            model, metrics, features = train_delay_predictor(shipments, routes)
+            metrics = load_snapshot('logistics')['metrics']
         
         col1, col2 = st.columns(2)
         col1.metric("Model MAE", f"{metrics['mae']:.2f} minutes")
         col2.metric("Model R² Score", f"{metrics['r2']:.3f}")
         
+        sketches = get_delay_sketches().value
+        p50, p95, p99 = sketches.global_sketch.quantiles([0.5, 0.95, 0.99])
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Median Delay", f"{p50:.0f} min")
+        col2.metric("P95 Delay", f"{p95:.0f} min")
+        col3.metric("P99 Delay", f"{p99:.0f} min")
+        
         st.markdown("### 📊 Delay Distribution")
-        fig = px.histogram(shipments, x='delay_minutes', nbins=50, title='Shipment Delay Distribution')
+        delay_hist = sketches.global_sketch.histogram(50)
+        fig = px.bar(delay_hist, x='bin_start', y='count', title='Shipment Delay Distribution')
+        fig.update_layout(bargap=0, xaxis_title='delay_minutes')
         st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("### ⏱️ Delay SLA by Route")
+        route_sla = sketches.route_quantiles().sort_values('p95', ascending=False)
+        st.dataframe(route_sla, use_container_width=True)
     
     with tab2:
         st.subheader("🗺️ Route Recommendations")
         
         with st.spinner("Analyzing routes..."):
-            model, metrics, features = train_delay_predictor(shipments, routes)
-            predictions = predict_route_delays(model, routes, features)
-            route_recs = recommend_optimal_routes(predictions, routes, top_n=15)
+            route_recs = load_snapshot('logistics')['route_recs']
         
         st.dataframe(route_recs[['route_id', 'origin', 'destination', 'distance_km', 
                                   'predicted_delay', 'risk_score', 'recommendation']], 
@@ -215,8 +260,8 @@ elif page == "⚙️ Predictive Maintenance":
     st.subheader("🔧 Machine Health Monitoring")
     
     with st.spinner("Analyzing machine health..."):
-        model, feature_cols, accuracy = train_failure_predictor(sensors)
-        health_report = predict_machine_health(model, sensors, machines, feature_cols)
+        maintenance = load_snapshot('maintenance')
+        accuracy, health_report = maintenance['accuracy'], maintenance['health_report']
     
     st.metric("Model Accuracy", f"{accuracy*100:.1f}%")
     
@@ -248,7 +293,7 @@ elif page == "⚙️ Predictive Maintenance":
 elif page == "📊 Analytics & Insights":
     st.title("📊 Advanced Analytics & Insights")
     
-    tab1, tab2, tab3 = st.tabs(["Business Metrics", "ESG Analytics", "Economic Indicators"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Business Metrics", "ESG Analytics", "Economic Indicators", "Customer Churn"])
     
     with tab1:
         st.subheader("📈 Key Business Metrics")
@@ -289,16 +334,40 @@ elif page == "📊 Analytics & Insights":
     with tab3:
         st.subheader("📉 Economic Indicators")
         
-        economy['date'] = pd.to_datetime(economy['date'])
+        economy = economy.assign(date=pd.to_datetime(economy['date']))
+        
+        zoom = st.slider("Date Range", min_value=economy['date'].min().to_pydatetime(),
+                         max_value=economy['date'].max().to_pydatetime(),
+                         value=(economy['date'].min().to_pydatetime(), economy['date'].max().to_pydatetime()))
+        oil_series = downsample_frame(economy, 'date', 'oil_price', x_range=zoom)
         
         fig = go.Figure()
-        fig.add_trace(go.Scatter(x=economy['date'], y=economy['oil_price'], name='Oil Price'))
+        fig.add_trace(go.Scatter(x=oil_series['date'], y=oil_series['oil_price'], name='Oil Price'))
         fig.update_layout(title='Oil Price Trend', xaxis_title='Date', yaxis_title='Price ($)')
         st.plotly_chart(fig, use_container_width=True)
         
         col1, col2 = st.columns(2)
         col1.metric("Current Oil Price", f"${economy['oil_price'].iloc[-1]:.2f}")
         col2.metric("Market Index", f"{economy['market_index'].iloc[-1]:.0f}")
+    
+    with tab4:
+        st.subheader("👥 Customer RFM & Churn Risk")
+        
+        with st.spinner("Scoring customers..."):
+            churn = load_snapshot('customers')
+        
+        col1, col2 = st.columns(2)
+        col1.metric("Churn Model Accuracy", f"{churn['metrics']['accuracy']*100:.1f}%")
+        col2.metric("Churn Model AUC", f"{churn['metrics']['auc']:.3f}")
+        
+        fig = px.bar(churn['segments'], x='rfm_segment', y='customers', color='avg_churn_probability',
+                    title='Customers by RFM Segment')
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("### 🚨 At-Risk Customers")
+        st.dataframe(churn['at_risk'][['customer_id', 'segment', 'region', 'rfm_segment', 'recency_days',
+                                       'frequency', 'monetary', 'churn_probability', 'value_at_risk',
+                                       'risk_level']], use_container_width=True)
 
 st.sidebar.markdown("---")
 st.sidebar.info("**NovaCorp UDIP v1.0**\n\nBuilt with Streamlit, Prophet, XGBoost, and scikit-learn")
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+DEFAULT_MAX_POINTS = 2000
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _as_float(x):
+    """Numeric view of an x axis (datetimes become int64 nanoseconds)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+def _bucket_edges(n, n_buckets):
+    """Edges splitting points 1..n-2 into n_buckets contiguous buckets"""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(int)
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape
+
+    First and last points are always kept. The inner points are split into
+    n_out - 2 buckets; from each bucket the point forming the largest triangle
+    with the previously chosen point and the next bucket's centroid is kept.
+    Buckets are padded into one matrix so each step is a single row argmax.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+
+    n_buckets = n_out - 2
+    edges = _bucket_edges(n, n_buckets)
+    starts, ends = edges[:-1], edges[1:]
+    lengths = ends - starts
+    width = lengths.max()
+
+    # Padded (n_buckets x width) index matrix; padding repeats the bucket start
+    offsets = np.arange(width)
+    idx = starts[:, None] + np.minimum(offsets[None, :], lengths[:, None] - 1)
+    valid = offsets[None, :] < lengths[:, None]
+    bx, by = x[idx], y[idx]
+
+    # Centroid of the following bucket (the last bucket looks at the final point)
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    cx = np.append((sums_x / lengths)[1:], x[-1])
+    cy = np.append((sums_y / lengths)[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    ax, ay = x[0], y[0]
+    for b in range(n_buckets):
+        area = np.abs((ax - cx[b]) * (by[b] - ay) - (ax - bx[b]) * (cy[b] - ay))
+        area[~valid[b]] = -1
+        j = idx[b, area.argmax()]
+        selected[b + 1] = j
+        ax, ay = x[j], y[j]
+
+    return selected
+
+def minmax_indices(y, n_out):
+    """Min/max decimation: keep the extremes of each bucket (at most n_out points)"""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    n_buckets = (n_out - 2) // 2
+    edges = _bucket_edges(n, n_buckets)
+    starts, lengths = edges[:-1], np.diff(edges)
+    width = lengths.max()
+
+    offsets = np.arange(width)
+    idx = starts[:, None] + np.minimum(offsets[None, :], lengths[:, None] - 1)
+    values = y[idx]
+
+    rows = np.arange(n_buckets)
+    lo = idx[rows, values.argmin(axis=1)]
+    hi = idx[rows, values.argmax(axis=1)]
+
+    return np.unique(np.concatenate(([0], lo, hi, [n - 1])))
+
+def downsample_indices(x, y, n_out=DEFAULT_MAX_POINTS, method='lttb'):
+    """Row positions to plot for one series"""
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+def _series_key(x, y):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(_as_float(x)).tobytes())
+    digest.update(np.ascontiguousarray(np.asarray(y, dtype=float)).tobytes())
+    return digest.hexdigest()
+
+def downsample_frame(df, x, y, n_out=DEFAULT_MAX_POINTS, method='lttb', x_range=None):
+    """Downsample a frame for plotting y against x, optionally zoomed to x_range
+
+    Rows with a missing y are dropped and the frame is sorted by x first.
+    Results are cached per (series contents, zoom range, n_out, method), so
+    reruns of a Streamlit page with the same data and zoom reuse the indices.
+    """
+    data = df.dropna(subset=[y]).sort_values(x)
+    if x_range is not None:
+        lo, hi = x_range
+        data = data[(data[x] >= lo) & (data[x] <= hi)]
+
+    if len(data) <= n_out:
+        return data
+
+    xs, ys = data[x].to_numpy(), data[y].to_numpy()
+    key = (_series_key(xs, ys), n_out, method)
+    # Streamlit serves sessions from several threads; the LRU bookkeeping is
+    # locked, the downsampling itself is not (a miss may be computed twice)
+    with _cache_lock:
+        positions = _cache.get(key)
+        if positions is not None:
+            _cache.move_to_end(key)
+    if positions is None:
+        positions = downsample_indices(xs, ys, n_out, method)
+        with _cache_lock:
+            _cache[key] = positions
+            if len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    return data.iloc[positions]
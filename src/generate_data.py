@@ -161,7 +161,19 @@ for date in dates[::7]:  # Weekly
 comp_df = pd.DataFrame(comp_pricing)
 comp_df.to_csv(f'{output_dir}/competitor_pricing.csv', index=False)
 
+# Inventory (every location stocks every product)
+locations = [f'L{i:02d}' for i in range(1, 6)]
+inventory = pd.DataFrame({
+    'location_id': np.repeat(locations, len(products)),
+    'product_id': np.tile(products['product_id'], len(locations))
+})
+inventory['reorder_point'] = np.random.randint(20, 60, len(inventory))
+inventory['stock_level'] = (inventory['reorder_point'] * np.random.uniform(0.3, 3.0, len(inventory))).astype(int)
+inventory = inventory[['location_id', 'product_id', 'stock_level', 'reorder_point']]
+inventory.to_csv(f'{output_dir}/inventory.csv', index=False)
+
 print(f"✅ Generated {len(orders)} orders")
 print(f"✅ Generated {len(shipments)} shipments")
 print(f"✅ Generated {len(sensors)} sensor readings")
+print(f"✅ Generated {len(inventory)} inventory positions")
 print(f"✅ All data saved to {output_dir}/")
@@ -0,0 +1,202 @@
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+CHECKSUM_BYTES = 64 * 1024
+
+RAW_TABLES = {
+    'orders': 'orders.csv',
+    'products': 'products.csv',
+    'customers': 'customers.csv',
+    'shipments': 'shipments.csv',
+    'routes': 'routes.csv',
+    'machines': 'machines.csv',
+    'sensors': 'machine_sensors.csv',
+    'economy': 'external_economy.csv',
+    'competitor': 'competitor_pricing.csv',
+    'inventory': 'inventory.csv'
+}
+
+# Tables older data/raw directories may not have yet; skipped while their file is missing
+OPTIONAL_TABLES = {'inventory'}
+
+@dataclass
+class FileState:
+    """What has been consumed from one CSV file"""
+    offset: int
+    mtime: float
+    size: int
+    head_checksum: str
+    tail_checksum: str
+    content_checksum: str
+    header: bytes
+
+@dataclass
+class TableChange:
+    """Rows [start, stop) of `table` were added ('append') or the table was re-read ('reload')"""
+    table: str
+    kind: str
+    start: int
+    stop: int
+    added: pd.DataFrame
+
+def _checksum(f, start, stop):
+    f.seek(start)
+    return hashlib.blake2b(f.read(stop - start), digest_size=16).hexdigest()
+
+def _file_state(f, offset, header, stat, content):
+    return FileState(
+        offset=offset,
+        mtime=stat.st_mtime,
+        size=stat.st_size,
+        head_checksum=_checksum(f, 0, min(CHECKSUM_BYTES, offset)),
+        tail_checksum=_checksum(f, max(0, offset - CHECKSUM_BYTES), offset),
+        content_checksum=content.hexdigest(),
+        header=header
+    )
+
+class IncrementalLoader:
+    """Keeps data/raw tables in memory and re-reads only what was appended
+
+    For every file the loader records the byte offset it has parsed up to plus
+    checksums of the first and last 64 KB before that
+    offset. On refresh a file that grew with both checksums intact is treated
+    as append-only: only the new tail is parsed and concatenated. Any other
+    change (truncation, rewrite) falls back to a full re-read. An unterminated
+    line past the recorded offset may still be being written, so it is held back
+    until a refresh finds the file unchanged. Subscribers are
+    told exactly which rows were added, or that a table was reloaded.
+    A running hash of all consumed bytes (extended on append) gives every state
+    a content_checksum that any reader of the same file contents agrees on.
+    Tables listed in `optional` are skipped while their file does not exist.
+    """
+
+    def __init__(self, data_dir='data/raw', tables=None, optional=OPTIONAL_TABLES):
+        self.data_dir = data_dir
+        self.files = dict(tables or RAW_TABLES)
+        self.optional = set(optional)
+        self.tables = {}
+        self.states = {}
+        self._content = {}
+        self.version = 0
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, table, callback):
+        """Call callback(TableChange) whenever `table` gains rows or is reloaded"""
+        self._subscribers.setdefault(table, []).append(callback)
+
+    def snapshot(self):
+        """Consistent (tables, states) copies taken together under the refresh lock
+
+        Refresh replaces table frames and file states rather than mutating them,
+        so the shallow copies stay consistent with each other while later
+        refreshes move the loader on.
+        """
+        with self._lock:
+            return dict(self.tables), dict(self.states)
+
+    def path(self, table):
+        return os.path.join(self.data_dir, self.files[table])
+
+    def _full_read(self, table):
+        path = self.path(table)
+        with open(path, 'rb') as f:
+            data = f.read()
+            offset = len(data)
+            newline = data.find(b'\n')
+            header = data[:newline + 1] if newline >= 0 else data + b'\n'
+            df = pd.read_csv(io.BytesIO(data))
+            self._content[table] = hashlib.blake2b(data[:offset], digest_size=16)
+            state = _file_state(f, offset, header, os.fstat(f.fileno()), self._content[table])
+        return df, state
+
+    def _is_append(self, f, state, stat):
+        if stat.st_size < state.offset:
+            return False
+        if _checksum(f, 0, min(CHECKSUM_BYTES, state.offset)) != state.head_checksum:
+            return False
+        return _checksum(f, max(0, state.offset - CHECKSUM_BYTES), state.offset) == state.tail_checksum
+
+    def _read_tail(self, table):
+        """Parse the lines appended since the last read, or None if not append-only"""
+        state = self.states[table]
+        with open(self.path(table), 'rb') as f:
+            stat = os.fstat(f.fileno())
+            unchanged = stat.st_size == state.size and stat.st_mtime == state.mtime
+            if unchanged and state.offset == stat.st_size:
+                return self.tables[table].iloc[0:0]
+            if not unchanged and not self._is_append(f, state, stat):
+                return None
+
+            # A held-back partial line is complete once the file has stopped changing
+            f.seek(state.offset)
+            tail = f.read()
+            end = len(tail) if unchanged else tail.rfind(b'\n') + 1
+            offset = state.offset + end
+            added = pd.read_csv(io.BytesIO(state.header + tail[:end])) if end else self.tables[table].iloc[0:0]
+            self._content[table].update(tail[:end])
+            self.states[table] = _file_state(f, offset, state.header, stat, self._content[table])
+        return added
+
+    def _notify(self, change):
+        for callback in self._subscribers.get(change.table, []):
+            callback(change)
+
+    def refresh(self):
+        """Bring every table up to date; returns the list of TableChange applied"""
+        with self._lock:
+            changes = []
+            for table in self.files:
+                if table in self.optional and not os.path.exists(self.path(table)):
+                    continue
+                if table not in self.tables:
+                    added = None
+                else:
+                    added = self._read_tail(table)
+                    if added is not None and len(added) == 0:
+                        continue
+
+                if added is None:
+                    df, self.states[table] = self._full_read(table)
+                    self.tables[table] = df
+                    change = TableChange(table, 'reload', 0, len(df), df)
+                else:
+                    start = len(self.tables[table])
+                    df = pd.concat([self.tables[table], added], ignore_index=True)
+                    self.tables[table] = df
+                    change = TableChange(table, 'append', start, len(df), df.iloc[start:])
+                changes.append(change)
+
+            if changes:
+                self.version += 1
+            for change in changes:
+                self._notify(change)
+            return changes
+
+class IncrementalState:
+    """A derived value kept in sync with one loader table
+
+    `build(df)` computes it from the full table (initially and after a reload);
+    `update(value, added_rows)` folds in appended rows and returns the new value.
+    """
+
+    def __init__(self, loader, table, build, update):
+        self.build = build
+        self.update = update
+        self.value = None
+        self.rows = 0
+        loader.subscribe(table, self._on_change)
+        if table in loader.tables:
+            self._on_change(TableChange(table, 'reload', 0, len(loader.tables[table]), loader.tables[table]))
+
+    def _on_change(self, change):
+        if change.kind == 'reload':
+            self.value = self.build(change.added)
+        else:
+            self.value = self.update(self.value, change.added)
+        self.rows = change.stop
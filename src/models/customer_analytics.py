@@ -0,0 +1,188 @@
+import time
+
+import pandas as pd
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
+from sklearn.metrics import roc_auc_score
+
+def compute_customer_features(orders_df, customers_df, as_of=None):
+    """Recency, frequency, monetary value and channel mix for every customer in one pass
+
+    Orders are mapped to customer row positions once; sums and counts are
+    bincounts and the last order date is an unbuffered maximum.at scatter, so
+    there is no sort and no per-customer Python work.
+    Customers without orders get frequency 0 and recency measured from signup.
+    """
+    customer_ids = customers_df['customer_id'].to_numpy()
+    n = len(customer_ids)
+    pos = pd.Index(customer_ids).get_indexer(orders_df['customer_id'])
+    known = pos >= 0
+    pos = pos[known]
+
+    order_days = pd.to_datetime(orders_df['order_date']).to_numpy()[known].astype('datetime64[D]').astype(np.int64)
+    as_of_day = (pd.Timestamp(as_of) if as_of is not None else
+                 pd.Timestamp(order_days.max(), unit='D') + pd.Timedelta(days=1))
+    as_of_day = np.datetime64(as_of_day.date(), 'D').astype(np.int64)
+
+    revenue = (orders_df['price'] * orders_df['quantity']).to_numpy(dtype=float)[known]
+    frequency = np.bincount(pos, minlength=n)
+    monetary = np.bincount(pos, weights=revenue, minlength=n)
+    cancelled = np.bincount(pos, weights=orders_df['status'].eq('Cancelled').to_numpy()[known], minlength=n)
+
+    last_order = np.full(n, np.iinfo(np.int64).min)
+    np.maximum.at(last_order, pos, order_days)
+
+    signup_days = pd.to_datetime(customers_df['signup_date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+    tenure = np.maximum(as_of_day - signup_days, 0)
+    recency = np.where(frequency > 0, as_of_day - last_order, tenure)
+
+    features = pd.DataFrame({
+        'customer_id': customer_ids,
+        'recency_days': recency,
+        'frequency': frequency,
+        'monetary': monetary.round(2),
+        'avg_order_value': np.divide(monetary, frequency, out=np.zeros(n), where=frequency > 0).round(2),
+        'cancel_rate': np.divide(cancelled, frequency, out=np.zeros(n), where=frequency > 0).round(3),
+        'tenure_days': tenure
+    })
+
+    # Channel mix: share of each customer's orders per channel
+    channel_codes, channels = pd.factorize(orders_df['channel'])
+    channel_codes = channel_codes[known]
+    mix = np.bincount(pos * len(channels) + channel_codes, minlength=n * len(channels)).reshape(n, len(channels))
+    for j, channel in enumerate(channels):
+        features[f'channel_{str(channel).lower()}_share'] = np.divide(
+            mix[:, j], frequency, out=np.zeros(n), where=frequency > 0
+        ).round(3)
+
+    return features
+
+def score_rfm(features):
+    """1-5 quintile scores for recency (recent = 5), frequency and monetary value"""
+    scored = features.copy()
+    scored['r_score'] = np.ceil(scored['recency_days'].rank(pct=True, ascending=False) * 5).astype(int)
+    scored['f_score'] = np.ceil(scored['frequency'].rank(pct=True) * 5).astype(int)
+    scored['m_score'] = np.ceil(scored['monetary'].rank(pct=True) * 5).astype(int)
+    scored['rfm_score'] = scored['r_score'] * 100 + scored['f_score'] * 10 + scored['m_score']
+    scored['rfm_segment'] = np.select(
+        [
+            (scored['r_score'] >= 4) & (scored['f_score'] >= 4),
+            (scored['r_score'] <= 2) & (scored['f_score'] >= 4),
+            scored['r_score'] <= 2
+        ],
+        ['Champions', 'At Risk Loyal', 'Lapsing'],
+        default='Regular'
+    )
+    return scored
+
+def churn_feature_matrix(features, customers_df):
+    """Model inputs: RFM and channel features plus one-hot segment and region"""
+    base = features.drop(columns=['customer_id']).reset_index(drop=True)
+    dummies = pd.get_dummies(customers_df[['segment', 'region']].reset_index(drop=True), dtype=float)
+    return pd.concat([base, dummies], axis=1)
+
+def _churn_classifier():
+    return RandomForestClassifier(n_estimators=100, max_depth=10, class_weight='balanced',
+                                  random_state=42, n_jobs=-1)
+
+def train_churn_model(X, y):
+    """Random Forest churn classifier trained on all cores"""
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    model = _churn_classifier()
+    model.fit(X_train, y_train)
+
+    proba = model.predict_proba(X_test)[:, 1]
+    metrics = {
+        'accuracy': model.score(X_test, y_test),
+        'auc': roc_auc_score(y_test, proba) if len(np.unique(y_test)) > 1 else np.nan
+    }
+    return model, metrics
+
+def out_of_fold_scores(X, y, n_splits=5):
+    """Churn probability of every labeled row from a model that never saw that row"""
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+    return cross_val_predict(_churn_classifier(), X, y, cv=cv, method='predict_proba', n_jobs=-1)[:, 1]
+
+def batch_score(model, X, batch_size=500_000):
+    """Churn probability for every row, scored in fixed-size batches (trees in parallel)"""
+    scores = np.empty(len(X))
+    for start in range(0, len(X), batch_size):
+        scores[start:start + batch_size] = model.predict_proba(X.iloc[start:start + batch_size])[:, 1]
+    return scores
+
+def rank_at_risk_customers(scored, customers_df, top_n=50):
+    """Active customers ranked by expected lifetime value lost to churn"""
+    ranked = scored.merge(customers_df[['customer_id', 'segment', 'region', 'churn_flag', 'lifetime_value']],
+                          on='customer_id')
+    ranked = ranked[ranked['churn_flag'] == 0].copy()
+    ranked['value_at_risk'] = (ranked['churn_probability'] * ranked['lifetime_value']).round(2)
+    ranked['risk_level'] = pd.cut(ranked['churn_probability'], bins=[-0.01, 0.3, 0.6, 1.0],
+                                  labels=['Low', 'Medium', 'High'])
+    return ranked.sort_values('value_at_risk', ascending=False).head(top_n)
+
+def analyze_customers(orders_df, customers_df, top_n=50):
+    """RFM features, churn model and ranked at-risk list for the customer base
+
+    Labeled customers get out-of-fold probabilities, so no score comes from a
+    model that trained on that customer; the fitted model only scores customers
+    without a churn_flag yet.
+    """
+    features = compute_customer_features(orders_df, customers_df)
+    X = churn_feature_matrix(features, customers_df)
+    labeled = customers_df['churn_flag'].notna().to_numpy()
+    y = customers_df['churn_flag'].to_numpy()[labeled].astype(int)
+
+    model, metrics = train_churn_model(X[labeled], y)
+    churn_probability = np.empty(len(X))
+    churn_probability[labeled] = out_of_fold_scores(X[labeled], y)
+    if not labeled.all():
+        churn_probability[~labeled] = batch_score(model, X[~labeled])
+
+    scored = score_rfm(features)
+    scored['churn_probability'] = churn_probability.round(3)
+
+    at_risk = rank_at_risk_customers(scored, customers_df, top_n=top_n)
+    return scored, at_risk, metrics
+
+def _synthetic_orders(n_customers, orders_per_customer=5, seed=42):
+    rng = np.random.default_rng(seed)
+    n_orders = n_customers * orders_per_customer
+    customers = pd.DataFrame({
+        'customer_id': np.arange(1, n_customers + 1),
+        'signup_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 700, n_customers), unit='D')
+    })
+    orders = pd.DataFrame({
+        'customer_id': rng.integers(1, n_customers + 1, n_orders),
+        'order_date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n_orders), unit='D'),
+        'price': rng.uniform(20, 500, n_orders),
+        'quantity': rng.integers(1, 10, n_orders),
+        'channel': rng.choice(['Online', 'Store', 'Mobile'], n_orders),
+        'status': rng.choice(['Completed', 'Pending', 'Cancelled'], n_orders, p=[0.85, 0.1, 0.05])
+    })
+    return orders, customers
+
+def benchmark_customer_features(sizes=(100_000, 1_000_000, 2_000_000)):
+    """Time compute_customer_features on synthetic customer bases (5 orders each)"""
+    results = []
+    for n_customers in sizes:
+        orders, customers = _synthetic_orders(n_customers)
+        start = time.perf_counter()
+        compute_customer_features(orders, customers)
+        results.append({
+            'customers': n_customers,
+            'orders': len(orders),
+            'seconds': round(time.perf_counter() - start, 3)
+        })
+    return pd.DataFrame(results)
+
+if __name__ == '__main__':
+    # Run from the repo root: PYTHONPATH=src python -m models.customer_analytics
+    orders = pd.read_csv('data/raw/orders.csv')
+    customers = pd.read_csv('data/raw/customers.csv')
+
+    scored, at_risk, metrics = analyze_customers(orders, customers, top_n=15)
+    print(f"✅ Churn model accuracy {metrics['accuracy']*100:.1f}%, AUC {metrics['auc']:.3f}")
+    print(at_risk[['customer_id', 'segment', 'rfm_segment', 'churn_probability', 'value_at_risk']].to_string(index=False))
+    print(benchmark_customer_features().to_string(index=False))
@@ -0,0 +1,228 @@
+import pandas as pd
+import numpy as np
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+class DelaySketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style)
+
+    Values are counted in logarithmic buckets: every value v with |v| >= min_value
+    falls in bucket ceil(log_gamma(|v|)), gamma = (1 + a) / (1 - a), so any
+    quantile is returned within relative error `a` of the exact answer. Buckets
+    are a fixed-size array, so memory is constant, updates are one bincount and
+    merging two sketches (from other partitions or workers) is an array add.
+    """
+
+    def __init__(self, relative_accuracy=0.01, n_bins=2048, min_value=1e-2):
+        self.relative_accuracy = relative_accuracy
+        self.n_bins = n_bins
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._key_offset = int(np.ceil(np.log(min_value) / self._log_gamma))
+
+        self.positive = np.zeros(n_bins, dtype=np.int64)
+        self.negative = np.zeros(n_bins, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def bucket_keys(self, values):
+        """Bucket index of each value's magnitude (values below min_value are not indexed)"""
+        magnitude = np.maximum(np.abs(values), self.min_value)
+        keys = np.ceil(np.log(magnitude) / self._log_gamma).astype(np.int64) - self._key_offset
+        return np.clip(keys, 0, self.n_bins - 1)
+
+    def bucket_values(self):
+        """Representative value of every bucket (the relative-error midpoint)"""
+        keys = np.arange(self.n_bins) + self._key_offset
+        return 2 * self.gamma ** keys / (self.gamma + 1)
+
+    def update(self, values):
+        """Add an array of observations"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        is_zero = np.abs(values) < self.min_value
+        pos = values[(values > 0) & ~is_zero]
+        neg = values[(values < 0) & ~is_zero]
+        self.positive += np.bincount(self.bucket_keys(pos), minlength=self.n_bins)
+        self.negative += np.bincount(self.bucket_keys(neg), minlength=self.n_bins)
+        self.zero_count += int(is_zero.sum())
+
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def _check_compatible(self, other):
+        if (self.relative_accuracy, self.n_bins, self.min_value) != \
+                (other.relative_accuracy, other.n_bins, other.min_value):
+            raise ValueError("Cannot merge sketches with different parameters")
+
+    def merge(self, other):
+        """Fold another sketch into this one (in place)"""
+        self._check_compatible(other)
+        self.positive += other.positive
+        self.negative += other.negative
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _ordered_buckets(self):
+        """(values, counts) for all buckets in ascending value order"""
+        reps = self.bucket_values()
+        values = np.concatenate((-reps[::-1], [0.0], reps))
+        counts = np.concatenate((self.negative[::-1], [self.zero_count], self.positive))
+        return values, counts
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        """Approximate quantiles, clamped to the observed min/max"""
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+
+        values, counts = self._ordered_buckets()
+        ranks = qs * (self.count - 1)
+        positions = np.searchsorted(np.cumsum(counts), ranks, side='right')
+        return np.clip(values[positions], self.min, self.max)
+
+    def quantile(self, q):
+        """Approximate q-quantile"""
+        return float(self.quantiles([q])[0])
+
+    def mean(self):
+        """Exact mean of all observations"""
+        return self.total / self.count if self.count else np.nan
+
+    def histogram(self, bins=50):
+        """Approximate histogram counts over `bins` edges (or that many equal-width bins)
+
+        With a bin count, an empty sketch gives an empty frame and a sketch of one
+        distinct value a single [min, max] bin.
+        """
+        if np.isscalar(bins):
+            if self.count == 0:
+                empty = np.array([])
+                return pd.DataFrame({'bin_start': empty, 'bin_end': empty, 'count': empty.astype(np.int64)})
+            if self.min == self.max:
+                return pd.DataFrame({'bin_start': [self.min], 'bin_end': [self.max], 'count': [self.count]})
+            bins = np.linspace(self.min, self.max, int(bins) + 1)
+        values, counts = self._ordered_buckets()
+        values = np.clip(values, self.min, self.max)
+        hist, edges = np.histogram(values, bins=bins, weights=counts)
+        return pd.DataFrame({
+            'bin_start': edges[:-1],
+            'bin_end': edges[1:],
+            'count': hist.astype(np.int64)
+        })
+
+class RouteDelaySketches:
+    """Per-route and global DelaySketch, all sharing one parameter set
+
+    A batch of shipments is bucketed with a single 2D (routes x bins) bincount
+    and then added row by row, whatever the number of routes in the batch.
+    """
+
+    def __init__(self, **sketch_params):
+        self.sketch_params = sketch_params
+        self.global_sketch = DelaySketch(**sketch_params)
+        self.route_ids = []
+        self._route_pos = {}
+        self._routes = []
+
+    def _route_index(self, route_ids):
+        """Row of each (distinct) route id, registering new routes"""
+        for route_id in route_ids:
+            if route_id not in self._route_pos:
+                self._route_pos[route_id] = len(self.route_ids)
+                self.route_ids.append(route_id)
+                self._routes.append(DelaySketch(**self.sketch_params))
+        return np.array([self._route_pos[r] for r in route_ids], dtype=np.int64)
+
+    def update(self, shipments_df, value_col='delay_minutes'):
+        """Stream a batch of shipments into the route and global sketches"""
+        batch = shipments_df[['route_id', value_col]].dropna()
+        if len(batch) == 0:
+            return self
+        self.global_sketch.update(batch[value_col].to_numpy())
+
+        codes, uniques = pd.factorize(batch['route_id'])
+        route_idx = self._route_index(uniques)
+        values = batch[value_col].to_numpy(dtype=float)
+
+        sketch = self.global_sketch
+        n_bins = sketch.n_bins
+        is_zero = np.abs(values) < sketch.min_value
+        keys = sketch.bucket_keys(values)
+        flat = codes * n_bins + keys
+
+        n_routes = len(uniques)
+        size = n_routes * n_bins
+        pos = np.bincount(flat[(values > 0) & ~is_zero], minlength=size).reshape(n_routes, n_bins)
+        neg = np.bincount(flat[(values < 0) & ~is_zero], minlength=size).reshape(n_routes, n_bins)
+        zeros = np.bincount(codes[is_zero], minlength=n_routes)
+        counts = np.bincount(codes, minlength=n_routes)
+        totals = np.bincount(codes, weights=values, minlength=n_routes)
+        mins = pd.Series(values).groupby(codes).min().to_numpy()
+        maxs = pd.Series(values).groupby(codes).max().to_numpy()
+
+        for i, r in enumerate(route_idx):
+            route = self._routes[r]
+            route.positive += pos[i]
+            route.negative += neg[i]
+            route.zero_count += int(zeros[i])
+            route.count += int(counts[i])
+            route.total += float(totals[i])
+            route.min = min(route.min, float(mins[i]))
+            route.max = max(route.max, float(maxs[i]))
+        return self
+
+    def merge(self, other):
+        """Fold sketches built on another partition into this one (in place)"""
+        self.global_sketch.merge(other.global_sketch)
+        for route_id, sketch in zip(other.route_ids, other._routes):
+            r = self._route_index([route_id])[0]
+            self._routes[r].merge(sketch)
+        return self
+
+    def route(self, route_id):
+        """Sketch for one route"""
+        return self._routes[self._route_pos[route_id]]
+
+    def route_quantiles(self, qs=DEFAULT_QUANTILES):
+        """One row per route with shipment count, mean delay and the requested quantiles"""
+        rows = []
+        for route_id, sketch in zip(self.route_ids, self._routes):
+            row = {'route_id': route_id, 'shipments': sketch.count, 'mean_delay': round(sketch.mean(), 2)}
+            for q, value in zip(qs, sketch.quantiles(qs)):
+                row[f'p{round(q * 100):g}'] = round(value, 1)
+            rows.append(row)
+        return pd.DataFrame(rows).sort_values('route_id').reset_index(drop=True)
+
+def merge_sketches(sketches):
+    """Merge partial sketches (DelaySketch or RouteDelaySketches) into the first one"""
+    sketches = list(sketches)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+def build_delay_sketches(shipments_df, **sketch_params):
+    """Route and global delay sketches for an in-memory shipments table"""
+    return RouteDelaySketches(**sketch_params).update(shipments_df)
+
+def sketch_delays_from_csv(path, chunksize=1_000_000, **sketch_params):
+    """Stream a shipments CSV in chunks into route and global delay sketches"""
+    sketches = RouteDelaySketches(**sketch_params)
+    for chunk in pd.read_csv(path, usecols=['route_id', 'delay_minutes'], chunksize=chunksize):
+        sketches.update(chunk)
+    return sketches
@@ -34,6 +34,34 @@ def forecast_product_demand(orders_df, product_id, periods=30):
     
     return forecast
 
+def daily_demand_matrix(orders_df):
+    """Product x day matrix of units sold on a shared calendar (missing days = 0)"""
+    dates = pd.to_datetime(orders_df['order_date'])
+    daily = orders_df.groupby(['product_id', dates])['quantity'].sum().unstack(fill_value=0)
+    calendar = pd.date_range(daily.columns.min(), daily.columns.max(), freq='D')
+    return daily.reindex(columns=calendar, fill_value=0)
+
+def forecast_all_products_demand(orders_df, alpha=0.3):
+    """Exponential smoothing forecast for every product in one matrix product
+
+    The smoothed level equals the weighted sum alpha*(1-alpha)^k over past days
+    (first day weight (1-alpha)^(n-1)), so all products are forecast with a single
+    product x day matrix times weight vector instead of a loop per product.
+    """
+    daily = daily_demand_matrix(orders_df)
+    values = daily.to_numpy(dtype=float)
+    n_days = values.shape[1]
+
+    weights = alpha * (1 - alpha) ** np.arange(n_days - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (n_days - 1)
+    level = values @ weights
+
+    return pd.DataFrame({
+        'product_id': daily.index,
+        'daily_demand': level,
+        'demand_std': values.std(axis=1)
+    })
+
 def calculate_dynamic_price(forecast_demand, competitor_price, cost, base_price, elasticity=-1.5):
     """Calculate optimal price based on demand forecast"""
     if forecast_demand <= 0:
@@ -0,0 +1,212 @@
+import time
+
+import pandas as pd
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+def build_route_delay_table(predictions_df):
+    """Pivot predict_route_delays output into a route x hour matrix"""
+    table = predictions_df.pivot_table(index='route_id', columns='hour_of_day',
+                                       values='predicted_delay', aggfunc='mean')
+    return table.sort_index(axis=1)
+
+def lookup_predicted_delay(shipments_df, delay_table):
+    """Predicted delay per shipment, using the nearest predicted hour of its route"""
+    hours = delay_table.columns.to_numpy()
+    ship_hours = pd.to_datetime(shipments_df['planned_departure']).dt.hour.to_numpy()
+    nearest = np.abs(ship_hours[:, None] - hours[None, :]).argmin(axis=1)
+
+    row_idx = delay_table.index.get_indexer(shipments_df['route_id'])
+    values = delay_table.to_numpy()
+    delays = np.where(row_idx >= 0, values[np.maximum(row_idx, 0), nearest], np.nan)
+
+    # Routes without a prediction fall back to the fleet-wide mean
+    return np.where(np.isnan(delays), np.nanmean(values), delays)
+
+def vehicle_delay_bias(history_df):
+    """Mean historical delay of each vehicle relative to the fleet mean"""
+    by_vehicle = history_df.groupby('vehicle_id')['delay_minutes'].mean()
+    return by_vehicle - history_df['delay_minutes'].mean()
+
+def prepare_assignment_inputs(pending_df, vehicles_df, routes_df, predictions_df, history_df=None):
+    """Attach route, predicted delay and expected return time to pending shipments, cost inputs to vehicles"""
+    route_cols = ['route_id', 'origin', 'destination', 'distance_km', 'avg_time_mins']
+    shipments = pending_df.merge(routes_df[route_cols], on='route_id', how='left')
+    shipments['predicted_delay'] = lookup_predicted_delay(shipments, build_route_delay_table(predictions_df))
+
+    # A vehicle is busy from departure until the trip's expected arrival at its destination
+    shipments['departure'] = pd.to_datetime(shipments['planned_departure'])
+    trip_mins = shipments['avg_time_mins'].fillna(0) + np.maximum(shipments['predicted_delay'], 0)
+    shipments['busy_until'] = shipments['departure'] + pd.to_timedelta(trip_mins, unit='m')
+
+    vehicles = vehicles_df.copy()
+    if 'litres_per_km' not in vehicles:
+        vehicles['litres_per_km'] = 0.1
+    if history_df is not None:
+        vehicles['delay_bias'] = vehicles['vehicle_id'].map(vehicle_delay_bias(history_df)).fillna(0.0)
+    else:
+        vehicles['delay_bias'] = 0.0
+
+    return shipments, vehicles
+
+def assignment_cost_matrix(shipments, vehicles, fuel_price=1.5, delay_cost_per_min=0.5,
+                           reposition_cost=0.0):
+    """Cost of sending each vehicle (columns) on each shipment (rows)
+
+    cost = delay_cost * (predicted route delay + vehicle delay bias)
+         + fuel_price * distance_km * vehicle litres_per_km
+         + reposition_cost where the vehicle's known location differs from the shipment origin
+    """
+    delay = shipments['predicted_delay'].to_numpy()[:, None] + vehicles['delay_bias'].to_numpy()[None, :]
+    fuel = shipments['distance_km'].to_numpy()[:, None] * vehicles['litres_per_km'].to_numpy()[None, :]
+    cost = delay_cost_per_min * np.maximum(delay, 0) + fuel_price * fuel
+
+    if reposition_cost and 'location' in vehicles and 'origin' in shipments:
+        location = vehicles['location'].to_numpy()
+        mismatch = (shipments['origin'].to_numpy()[:, None] != location[None, :]) & pd.notna(location)[None, :]
+        cost = cost + reposition_cost * mismatch
+
+    return cost
+
+def _solve_block(shipments, vehicles, **cost_kwargs):
+    """Min-cost assignment of one block; returns (shipment_idx, vehicle_idx, cost) arrays"""
+    if len(shipments) == 0 or len(vehicles) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int), np.array([])
+
+    cost = assignment_cost_matrix(shipments, vehicles, **cost_kwargs)
+    rows, cols = linear_sum_assignment(cost)
+    return shipments.index.to_numpy()[rows], vehicles.index.to_numpy()[cols], cost[rows, cols]
+
+def assign_vehicles(pending_df, vehicles_df, routes_df, predictions_df, history_df=None,
+                    window_hours=2, fuel_price=1.5, delay_cost_per_min=0.5, reposition_cost=50.0):
+    """Assign available vehicles to a day's pending shipments at minimum cost
+
+    Shipments are bucketed into departure windows of `window_hours` and solved
+    window by window in time order. Each vehicle carries its availability and
+    location across windows: after a trip it is busy until departure + route
+    avg_time_mins + predicted delay and then stands at the route destination
+    (initially at its `depot`, if given). A window only sees vehicles that are
+    free by its first departure; shipments are matched first to free vehicles
+    already at their origin, and the rest to the remaining free vehicles with a
+    repositioning cost. Shipments on unknown routes or without a planned
+    departure cannot be costed and are returned unassigned.
+    """
+    shipments, vehicles = prepare_assignment_inputs(pending_df, vehicles_df, routes_df,
+                                                    predictions_df, history_df)
+    shipments = shipments.reset_index(drop=True)
+    vehicles = vehicles.reset_index(drop=True)
+    shipments['window'] = shipments['departure'].dt.floor(f'{window_hours}h')
+
+    vehicles['location'] = vehicles['depot'] if 'depot' in vehicles else None
+    available_at = np.full(len(vehicles), np.datetime64('NaT'), dtype='datetime64[ns]')
+    cost_kwargs = {'fuel_price': fuel_price, 'delay_cost_per_min': delay_cost_per_min}
+
+    solvable = shipments.dropna(subset=['distance_km', 'departure'])
+
+    ship_idx, veh_idx, costs = [], [], []
+    for _, window_ships in solvable.groupby('window', sort=True):
+        first_departure = window_ships['departure'].min().to_datetime64()
+        free = np.isnat(available_at) | (available_at <= first_departure)
+        free_vehicles = vehicles[free]
+
+        matched_ships, matched_vehicles = [], []
+        for origin, origin_ships in window_ships.groupby('origin', sort=False):
+            at_origin = free_vehicles[free_vehicles['location'] == origin]
+            s, v, c = _solve_block(origin_ships, at_origin, **cost_kwargs)
+            ship_idx.append(s); veh_idx.append(v); costs.append(c)
+            matched_ships.append(s); matched_vehicles.append(v)
+
+        leftover_ships = window_ships.drop(np.concatenate(matched_ships)) if matched_ships else window_ships
+        if matched_vehicles:
+            free_vehicles = free_vehicles.drop(np.concatenate(matched_vehicles))
+        s, v, c = _solve_block(leftover_ships, free_vehicles, reposition_cost=reposition_cost, **cost_kwargs)
+        ship_idx.append(s); veh_idx.append(v); costs.append(c)
+
+        # Vehicles that took a trip this window are busy until it ends, then sit at its destination
+        s = np.concatenate(matched_ships + [s])
+        v = np.concatenate(matched_vehicles + [v])
+        available_at[v] = shipments['busy_until'].to_numpy()[s]
+        vehicles.loc[v, 'location'] = shipments['destination'].to_numpy()[s]
+
+    ship_idx = np.concatenate(ship_idx) if ship_idx else np.array([], dtype=int)
+    veh_idx = np.concatenate(veh_idx) if veh_idx else np.array([], dtype=int)
+    costs = np.concatenate(costs) if costs else np.array([])
+
+    result = shipments.drop(columns=['vehicle_id'], errors='ignore')
+    result['vehicle_id'] = None
+    result['assignment_cost'] = np.nan
+    result.loc[ship_idx, 'vehicle_id'] = vehicles['vehicle_id'].to_numpy()[veh_idx]
+    result.loc[ship_idx, 'assignment_cost'] = costs
+    result['assigned'] = result['vehicle_id'].notna()
+
+    return result.drop(columns=['window', 'departure'])
+
+def schedule_overlaps(assignment_df):
+    """Assigned shipments that depart before the same vehicle's previous trip has ended"""
+    trips = assignment_df[assignment_df['assigned']].assign(
+        departure=lambda df: pd.to_datetime(df['planned_departure'])
+    ).sort_values(['vehicle_id', 'departure'])
+    previous_end = trips.groupby('vehicle_id')['busy_until'].shift()
+    return trips[trips['departure'] < previous_end].drop(columns='departure')
+
+def summarize_assignment(assignment_df):
+    """Headline numbers for an assignment run"""
+    assigned = assignment_df[assignment_df['assigned']]
+    return {
+        'shipments': len(assignment_df),
+        'assigned': len(assigned),
+        'unassigned': int((~assignment_df['assigned']).sum()),
+        'vehicles_used': assigned['vehicle_id'].nunique(),
+        'total_cost': round(float(assigned['assignment_cost'].sum()), 2),
+        'avg_predicted_delay': round(float(assigned['predicted_delay'].mean()), 2) if len(assigned) else 0.0
+    }
+
+def _synthetic_problem(n_shipments, n_vehicles, n_routes=50, n_depots=20, seed=42):
+    rng = np.random.default_rng(seed)
+    depots = [f'D{i:02d}' for i in range(n_depots)]
+    routes = pd.DataFrame({
+        'route_id': [f'R{i:03d}' for i in range(1, n_routes + 1)],
+        'origin': rng.choice(depots, n_routes),
+        'destination': rng.choice(depots, n_routes),
+        'distance_km': rng.uniform(50, 1000, n_routes).round(2),
+        'avg_time_mins': rng.integers(60, 600, n_routes)
+    })
+    predictions = pd.DataFrame({
+        'route_id': np.repeat(routes['route_id'].to_numpy(), 3),
+        'hour_of_day': np.tile([8, 14, 18], n_routes),
+        'predicted_delay': rng.uniform(0, 60, n_routes * 3)
+    })
+    pending = pd.DataFrame({
+        'shipment_id': np.arange(1, n_shipments + 1),
+        'route_id': rng.choice(routes['route_id'].to_numpy(), n_shipments),
+        'planned_departure': pd.Timestamp('2024-12-31') + pd.to_timedelta(rng.integers(0, 24, n_shipments), unit='h')
+    })
+    vehicles = pd.DataFrame({
+        'vehicle_id': [f'V{i:04d}' for i in range(1, n_vehicles + 1)],
+        'depot': rng.choice(depots, n_vehicles),
+        'litres_per_km': rng.uniform(0.08, 0.14, n_vehicles)
+    })
+    return pending, vehicles, routes, predictions
+
+def benchmark_assignment(sizes=((1000, 100), (2500, 250), (5000, 500), (10000, 1000))):
+    """Time assign_vehicles on synthetic problems of increasing size"""
+    results = []
+    for n_shipments, n_vehicles in sizes:
+        pending, vehicles, routes, predictions = _synthetic_problem(n_shipments, n_vehicles)
+        start = time.perf_counter()
+        assignment = assign_vehicles(pending, vehicles, routes, predictions)
+        elapsed = time.perf_counter() - start
+
+        summary = summarize_assignment(assignment)
+        results.append({
+            'shipments': n_shipments,
+            'vehicles': n_vehicles,
+            'assigned': summary['assigned'],
+            'overlaps': len(schedule_overlaps(assignment)),
+            'seconds': round(elapsed, 3)
+        })
+    return pd.DataFrame(results)
+
+if __name__ == '__main__':
+    # Run from the repo root: PYTHONPATH=src python -m models.fleet_assignment
+    print(benchmark_assignment().to_string(index=False))
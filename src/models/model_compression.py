@@ -0,0 +1,180 @@
+import copy
+import pickle
+import time
+
+import pandas as pd
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_absolute_error, r2_score, accuracy_score, balanced_accuracy_score
+
+from models.logistics_optimizer import prepare_shipment_features
+from models.predictive_maintenance import create_rolling_features
+
+def model_size_bytes(model):
+    """Serialized size of a fitted model in bytes"""
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+def measure_latency_ms(model, X, repeats=3):
+    """Best-of-n wall time (ms) to score X"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def prune_forest(model, n_trees):
+    """Return a shallow copy of a fitted forest keeping only the first n_trees"""
+    pruned = copy.copy(model)
+    pruned.estimators_ = model.estimators_[:n_trees]
+    pruned.n_estimators = n_trees
+    return pruned
+
+def _score(model, X_test, y_test, task):
+    y_pred = model.predict(X_test)
+    if task == 'regression':
+        return {'mae': mean_absolute_error(y_test, y_pred), 'r2': r2_score(y_test, y_pred)}
+    return {'accuracy': accuracy_score(y_test, y_pred),
+            'balanced_accuracy': balanced_accuracy_score(y_test, y_pred)}
+
+def _row(model, method, n_trees, max_depth, X_test, y_test, task):
+    row = {'method': method, 'n_estimators': n_trees, 'max_depth': max_depth}
+    row.update(_score(model, X_test, y_test, task))
+    row['latency_ms'] = measure_latency_ms(model, X_test)
+    row['size_bytes'] = model_size_bytes(model)
+    return row
+
+def compression_report(X_train, X_test, y_train, y_test, task='regression',
+                       n_estimators_grid=(10, 20, 50, 100), max_depth_grid=(4, 6, 8, 10),
+                       distill_depths=(6, 8, 10, 12), class_weight=None):
+    """Accuracy vs latency vs size curve for pruned, shallower and distilled models
+
+    One forest is trained per depth with the largest tree count; smaller counts are
+    evaluated by truncating its estimators, so the grid costs len(max_depth_grid) fits.
+    Forests train on all cores but are timed and returned with n_jobs=1, the same
+    single-threaded scoring as the distilled trees.
+    The reference model (max n_estimators, max depth) is also the distillation teacher.
+    For classification, `class_weight` is passed to every forest and student tree.
+    """
+    forest_cls = RandomForestRegressor if task == 'regression' else RandomForestClassifier
+    extra = {} if task == 'regression' else {'class_weight': class_weight}
+    max_trees = max(n_estimators_grid)
+
+    rows, models = [], []
+    teacher = None
+    for depth in sorted(max_depth_grid):
+        forest = forest_cls(n_estimators=max_trees, max_depth=depth, random_state=42, n_jobs=-1, **extra)
+        forest.fit(X_train, y_train)
+        forest.n_jobs = 1
+        teacher = forest
+        for n_trees in sorted(n_estimators_grid):
+            candidate = prune_forest(forest, n_trees)
+            rows.append(_row(candidate, 'forest', n_trees, depth, X_test, y_test, task))
+            models.append(candidate)
+
+    # Distil the teacher's decision surface into a single tree
+    teacher_labels = teacher.predict(X_train)
+    tree_cls = DecisionTreeRegressor if task == 'regression' else DecisionTreeClassifier
+    for depth in distill_depths:
+        student = tree_cls(max_depth=depth, random_state=42, **extra)
+        student.fit(X_train, teacher_labels)
+        rows.append(_row(student, 'distilled', 1, depth, X_test, y_test, task))
+        models.append(student)
+
+    report = pd.DataFrame(rows)
+    report['is_reference'] = (
+        (report['method'] == 'forest') &
+        (report['n_estimators'] == max_trees) &
+        (report['max_depth'] == max(max_depth_grid))
+    )
+    return report, models
+
+def select_compact_model(report, models, task='regression', tolerance=0.02):
+    """Pick the smallest model whose accuracy stays within tolerance of the reference
+
+    For regression the MAE may grow by at most `tolerance` (relative); for
+    classification the balanced accuracy may drop by at most `tolerance`
+    (absolute). Plain accuracy is not used: with ~3% faults a model that never
+    predicts a fault would stay within tolerance of the reference.
+    """
+    reference = report[report['is_reference']].iloc[0]
+    if task == 'regression':
+        ok = report['mae'] <= reference['mae'] * (1 + tolerance)
+    else:
+        ok = report['balanced_accuracy'] >= reference['balanced_accuracy'] - tolerance
+
+    candidates = report[ok].sort_values(['size_bytes', 'latency_ms'])
+    best_idx = candidates.index[0]
+    return models[best_idx], report.loc[best_idx]
+
+def compress_delay_predictor(shipments_df, routes_df, tolerance=0.02, **grid):
+    """Search for a compact delay model on the same split as train_delay_predictor"""
+    df, features = prepare_shipment_features(shipments_df, routes_df)
+    df = df.dropna(subset=features + ['delay_minutes'])
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[features], df['delay_minutes'], test_size=0.2, random_state=42
+    )
+    report, models = compression_report(X_train, X_test, y_train, y_test, task='regression', **grid)
+    model, chosen = select_compact_model(report, models, task='regression', tolerance=tolerance)
+
+    return model, report, chosen, features
+
+def compress_failure_predictor(sensor_df, tolerance=0.01, **grid):
+    """Search for a compact failure model on the same split as train_failure_predictor
+
+    Candidates are trained class-balanced, like train_failure_predictor_chunked,
+    so the rare fault class is not traded away for majority-class accuracy.
+    """
+    df = create_rolling_features(sensor_df.copy())
+    df = df.dropna()
+
+    feature_cols = [col for col in df.columns if 'rolling' in col or col in ['temperature', 'vibration', 'load_percent']]
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[feature_cols], df['fault_flag'], test_size=0.2, random_state=42, stratify=df['fault_flag']
+    )
+    report, models = compression_report(X_train, X_test, y_train, y_test, task='classification',
+                                        class_weight='balanced', **grid)
+    model, chosen = select_compact_model(report, models, task='classification', tolerance=tolerance)
+
+    return model, report, chosen, feature_cols
+
+def save_compact_model(model, features, path):
+    """Persist the chosen model together with its feature order"""
+    with open(path, 'wb') as f:
+        pickle.dump({'model': model, 'features': features}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_compact_model(path):
+    """Load a model written by save_compact_model"""
+    with open(path, 'rb') as f:
+        bundle = pickle.load(f)
+    return bundle['model'], bundle['features']
+
+if __name__ == '__main__':
+    # Run from the repo root: PYTHONPATH=src python -m models.model_compression
+    import os
+
+    output_dir = 'data/models'
+    os.makedirs(output_dir, exist_ok=True)
+
+    shipments = pd.read_csv('data/raw/shipments.csv')
+    routes = pd.read_csv('data/raw/routes.csv')
+    sensors = pd.read_csv('data/raw/machine_sensors.csv')
+
+    model, report, chosen, features = compress_delay_predictor(shipments, routes)
+    print("Delay predictor compression report:")
+    print(report.to_string(index=False))
+    print(f"✅ Chosen: {chosen['method']} n_estimators={chosen['n_estimators']} "
+          f"max_depth={chosen['max_depth']} ({chosen['size_bytes']/1024:.0f} KB)")
+    save_compact_model(model, features, f'{output_dir}/delay_predictor_compact.pkl')
+
+    model, report, chosen, features = compress_failure_predictor(sensors)
+    print("\nFailure predictor compression report:")
+    print(report.to_string(index=False))
+    print(f"✅ Chosen: {chosen['method']} n_estimators={chosen['n_estimators']} "
+          f"max_depth={chosen['max_depth']} ({chosen['size_bytes']/1024:.0f} KB)")
+    save_compact_model(model, features, f'{output_dir}/failure_predictor_compact.pkl')
+
+    print(f"✅ Compact models saved to {output_dir}/")
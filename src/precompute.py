@@ -0,0 +1,272 @@
+import argparse
+import glob
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.demand_forecast import generate_pricing_recommendations
+from models.logistics_optimizer import train_delay_predictor, predict_route_delays, recommend_optimal_routes
+from models.predictive_maintenance import train_failure_predictor, predict_machine_health
+from models.customer_analytics import analyze_customers
+from incremental_loader import RAW_TABLES, IncrementalLoader
+
+def pricing_pipeline(tables):
+    """Pricing recommendations for the top products"""
+    return {'recommendations': generate_pricing_recommendations(
+        tables['orders'], tables['products'], tables['competitor'], top_n=10
+    )}
+
+def logistics_pipeline(tables):
+    """Delay model metrics and route recommendations"""
+    model, metrics, features = train_delay_predictor(tables['shipments'], tables['routes'])
+    predictions = predict_route_delays(model, tables['routes'], features)
+    return {
+        'metrics': metrics,
+        'route_recs': recommend_optimal_routes(predictions, tables['routes'], top_n=15)
+    }
+
+def maintenance_pipeline(tables):
+    """Failure model accuracy and machine health report"""
+    model, feature_cols, accuracy = train_failure_predictor(tables['sensors'])
+    return {
+        'accuracy': accuracy,
+        'health_report': predict_machine_health(model, tables['sensors'], tables['machines'], feature_cols)
+    }
+
+def customer_pipeline(tables):
+    """Churn model metrics, RFM segment summary and ranked at-risk customers"""
+    scored, at_risk, metrics = analyze_customers(tables['orders'], tables['customers'], top_n=50)
+    segments = scored.groupby('rfm_segment').agg(
+        customers=('customer_id', 'size'),
+        avg_churn_probability=('churn_probability', 'mean'),
+        revenue=('monetary', 'sum')
+    ).reset_index()
+    return {'metrics': metrics, 'segments': segments, 'at_risk': at_risk}
+
+# name -> (input tables, pipeline function)
+PIPELINES = {
+    'pricing': (['orders', 'products', 'competitor'], pricing_pipeline),
+    'logistics': (['shipments', 'routes'], logistics_pipeline),
+    'maintenance': (['sensors', 'machines'], maintenance_pipeline),
+    'customers': (['orders', 'customers'], customer_pipeline)
+}
+
+@functools.lru_cache(maxsize=None)
+def pipeline_code_hash(name):
+    """Hash of a pipeline function and of every module whose functions it calls
+
+    Editing the pipeline (including its parameters) or the model code behind it
+    changes the hash, so snapshots computed by older code stop matching.
+    """
+    pipeline = PIPELINES[name][1]
+    modules = set()
+    for global_name in pipeline.__code__.co_names:
+        obj = pipeline.__globals__.get(global_name)
+        module = getattr(obj, '__module__', None)
+        if callable(obj) and module != pipeline.__module__ and module in sys.modules:
+            modules.add(module)
+
+    digest = hashlib.blake2b(inspect.getsource(pipeline).encode(), digest_size=12)
+    for module in sorted(modules):
+        digest.update(inspect.getsource(sys.modules[module]).encode())
+    return digest.hexdigest()
+
+def data_fingerprint(states, name):
+    """Identifies the pipeline code and the exact bytes of the input tables a snapshot was computed from
+
+    `states` are the loader file states captured with the tables (see IncrementalLoader.snapshot).
+    """
+    digest = hashlib.blake2b(pipeline_code_hash(name).encode(), digest_size=12)
+    for table in sorted(PIPELINES[name][0]):
+        state = states[table]
+        digest.update(f'{table}:{state.offset}:{state.content_checksum};'.encode())
+    return digest.hexdigest()
+
+class SnapshotStore:
+    """Versioned pipeline results on disk: <root>/<pipeline>/<version>.pkl
+
+    Snapshots are written to a temp file and renamed into place, so readers never
+    see a partial file; the newest `keep` versions of each pipeline are retained.
+    """
+
+    def __init__(self, root='data/snapshots', keep=5):
+        self.root = root
+        self.keep = keep
+
+    def _versions(self, name):
+        return sorted(glob.glob(os.path.join(self.root, name, '*.pkl')))
+
+    def save(self, name, result, fingerprint, seconds):
+        directory = os.path.join(self.root, name)
+        os.makedirs(directory, exist_ok=True)
+        version = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        snapshot = {
+            'pipeline': name,
+            'version': version,
+            'fingerprint': fingerprint,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(seconds, 2),
+            'result': result
+        }
+        path = os.path.join(directory, f'{version}.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+        # The dashboard and `precompute.py --watch` may prune the same directory at once
+        for old in self._versions(name)[:-self.keep]:
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass
+        return snapshot
+
+    def latest(self, name, fingerprint=None):
+        """Newest snapshot of a pipeline (optionally only if computed from `fingerprint`)"""
+        for path in reversed(self._versions(name)):
+            try:
+                with open(path, 'rb') as f:
+                    snapshot = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                continue
+            if fingerprint is None or snapshot['fingerprint'] == fingerprint:
+                return snapshot
+            return None
+        return None
+
+_pipeline_locks = {name: threading.Lock() for name in PIPELINES}
+
+def run_pipeline(name, loader, store, force=False):
+    """Run one pipeline on the loader's current tables and store the snapshot
+
+    Tables and file states are captured together, so the fingerprint always
+    describes exactly the data the pipeline ran on. Concurrent callers (a page
+    and the background thread) are serialized per pipeline; whoever waited
+    reuses the snapshot if it matches the same data.
+    """
+    pipeline = PIPELINES[name][1]
+    with _pipeline_locks[name]:
+        tables, states = loader.snapshot()
+        fingerprint = data_fingerprint(states, name)
+        if not force:
+            snapshot = store.latest(name, fingerprint)
+            if snapshot is not None:
+                return snapshot
+        start = time.perf_counter()
+        result = pipeline(tables)
+        return store.save(name, result, fingerprint, time.perf_counter() - start)
+
+def run_stale_pipelines(loader, store, names=None, max_workers=1):
+    """Refresh data, then run every pipeline whose latest snapshot is out of date"""
+    loader.refresh()
+    _, states = loader.snapshot()
+    stale = [
+        name for name in (names or PIPELINES)
+        if store.latest(name, data_fingerprint(states, name)) is None
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda name: run_pipeline(name, loader, store), stale))
+
+class PrecomputeScheduler:
+    """Background thread keeping pipeline snapshots fresh
+
+    Every `poll_seconds` the data files are checked for changes and stale
+    pipelines are recomputed; every `interval_seconds` all pipelines are rerun
+    regardless, like a cron job. A failing run is printed to stderr (with its
+    traceback the first time) and kept in `last_error` / `last_error_at` until
+    a run succeeds.
+    """
+
+    def __init__(self, loader, store, poll_seconds=60, interval_seconds=None, max_workers=1, names=None):
+        self.loader = loader
+        self.store = store
+        self.names = list(names or PIPELINES)
+        self.poll_seconds = poll_seconds
+        self.interval_seconds = interval_seconds
+        self.max_workers = max_workers
+        self.last_error = None
+        self.last_error_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='precompute', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        last_full_run = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                run_stale_pipelines(self.loader, self.store, self.names, self.max_workers)
+                if self.interval_seconds and time.monotonic() - last_full_run >= self.interval_seconds:
+                    for name in self.names:
+                        run_pipeline(name, self.loader, self.store, force=True)
+                    last_full_run = time.monotonic()
+                self.last_error = None
+                self.last_error_at = None
+            except Exception as e:
+                if repr(e) != repr(self.last_error):
+                    traceback.print_exc()
+                self.last_error = e
+                self.last_error_at = datetime.now()
+                print(f"⚠️ Precompute failed at {self.last_error_at:%H:%M:%S}: {e!r}", file=sys.stderr, flush=True)
+            self._stop.wait(self.poll_seconds)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute dashboard pipelines into snapshots")
+    parser.add_argument('--data-dir', default='data/raw')
+    parser.add_argument('--snapshot-dir', default='data/snapshots')
+    parser.add_argument('--pipelines', nargs='+', choices=sorted(PIPELINES), default=None)
+    parser.add_argument('--force', action='store_true', help="Rerun even if snapshots are fresh")
+    parser.add_argument('--watch', action='store_true', help="Keep running and recompute on data change")
+    parser.add_argument('--poll', type=int, default=60, help="Seconds between data change checks")
+    parser.add_argument('--interval', type=int, default=None, help="Seconds between forced full runs")
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    inputs = {table for name in (args.pipelines or PIPELINES) for table in PIPELINES[name][0]}
+    loader = IncrementalLoader(args.data_dir, {table: RAW_TABLES[table] for table in sorted(inputs)})
+    store = SnapshotStore(args.snapshot_dir)
+
+    if args.watch:
+        scheduler = PrecomputeScheduler(loader, store, args.poll, args.interval, args.workers,
+                                        args.pipelines).start()
+        print(f"✅ Watching {args.data_dir} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            scheduler.stop()
+        return
+
+    if args.force:
+        loader.refresh()
+        snapshots = [run_pipeline(name, loader, store, force=True) for name in (args.pipelines or PIPELINES)]
+    else:
+        snapshots = run_stale_pipelines(loader, store, args.pipelines, args.workers)
+
+    for snapshot in snapshots:
+        print(f"✅ {snapshot['pipeline']}: version {snapshot['version']} ({snapshot['seconds']}s)")
+    if not snapshots:
+        print("✅ All snapshots up to date")
+
+if __name__ == '__main__':
+    main()